@@ -1,26 +1,151 @@
-from subprocess import CalledProcessError, run
+import os
+import re
+import shutil
+import sys
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+from subprocess import DEVNULL, PIPE, CalledProcessError, run
 
 from semantic_version import NpmSpec, Version
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
-def node_matches(node_version: str | Version, required_engine: str = None):
+# `ioctl(FICLONE)` makes a copy-on-write clone on btrfs/XFS; the constant is only
+# exposed by `fcntl` from Python 3.12 on.
+_FICLONE = getattr(fcntl, "FICLONE", 0x40049409) if sys.platform == "linux" else None
+
+# Engine ranges common enough to skip NpmSpec's clause evaluation: `>=18.0.0`, and
+# `18`, `18.x` or `18.*`.
+_MINIMUM_RANGE = re.compile(r"^>=(\d+)\.(\d+)\.(\d+)$")
+_MAJOR_RANGE = re.compile(r"^(\d+)(?:\.[xX*])?$")
+
+
+@lru_cache(maxsize=256)
+def parse_version(version: str) -> Version:
+    # Versions and ranges are immutable, so parsed objects can be shared between callers.
+    return Version(version)
+
+
+@lru_cache(maxsize=256)
+def parse_spec(required_engine: str) -> NpmSpec:
+    return NpmSpec(required_engine)
+
+
+@lru_cache(maxsize=256)
+def compile_spec(required_engine: str) -> Callable[[Version], bool]:
+    # Parse even when specialized, so invalid ranges still raise.
+    spec = parse_spec(required_engine)
+    if match := _MINIMUM_RANGE.match(required_engine):
+        lower, upper = tuple(int(part) for part in match.groups()), None
+    elif match := _MAJOR_RANGE.match(required_engine):
+        major = int(match.group(1))
+        lower, upper = (major, 0, 0), (major + 1, 0, 0)
+    else:
+        return spec.__contains__
+
+    def matches(version: Version) -> bool:
+        # npm only matches prereleases in special cases, leave those to NpmSpec.
+        if version.prerelease:
+            return version in spec
+        release = (version.major, version.minor, version.patch)
+        return lower <= release and (upper is None or release < upper)
+
+    return matches
+
+
+def node_matches(node_version: str | Version, required_engine: str | None = None):
     # Pass the node version to semver to check that the node exec outputted a version.
     version = (
-        node_version if isinstance(node_version, Version) else Version(node_version)
+        node_version
+        if isinstance(node_version, Version)
+        else parse_version(node_version)
     )
     # No requirement -> return True
     if required_engine is None:
         return True
     else:
-        # Check that the version matches the package-json requirement range.
-        return version in NpmSpec(required_engine)
+        # Check that the version matches the package-json requirement range. Ranges
+        # are compiled once per process, keyed by their string.
+        return compile_spec(required_engine)(version)
 
 
-def get_node_executable_version(executable: str) -> str | None:
+def get_node_executable_version(executable: str | Path) -> str | None:
     node_command = [executable, "--version"]
     try:
-        node_process = run(node_command, check=True, capture_output=True)
+        # Only stdout is needed, don't allocate a pipe for stderr.
+        node_process = run(
+            node_command, check=True, stdout=PIPE, stderr=DEVNULL, text=True
+        )
     except (FileNotFoundError, CalledProcessError):
         return None
     else:
-        return node_process.stdout.decode("utf-8").strip()[1:]
+        return node_process.stdout.strip()[1:]
+
+
+@lru_cache(maxsize=8)
+def discover_node(executable: str | None) -> tuple[str, str] | None:
+    # Look up the executable (default: `node` on PATH) once per process, and only spawn
+    # it to read the version when it exists. Returns the path and the version.
+    node_executable = shutil.which(executable or "node")
+    if node_executable is None:
+        return None
+    node_version = get_node_executable_version(node_executable)
+    if node_version is None:
+        return None
+    return node_executable, node_version
+
+
+def select_copy_function(src_dir: Path, dst_dir: Path):
+    # Pick the cheapest `shutil.copytree` copy function up front: hardlinks only work
+    # within a single filesystem.
+    src_device = _device(src_dir)
+    if src_device is not None and src_device == _device(dst_dir):
+        return link_or_copy
+    return clone_or_copy
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    # Build artifacts are write-once, so the bundle can share their inodes.
+    _unlink_existing(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        return clone_or_copy(src, dst)
+    return dst
+
+
+def clone_or_copy(src: str, dst: str) -> str:
+    # Never write through an existing file: it may be a hardlink to `src`.
+    _unlink_existing(dst)
+    if _FICLONE is not None:
+        try:
+            with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+                fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+        except OSError:
+            pass
+        else:
+            shutil.copystat(src, dst)
+            return dst
+    return shutil.copy2(src, dst)
+
+
+def _unlink_existing(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _device(path: Path) -> int | None:
+    # The destination may not exist yet, use its closest existing parent.
+    path = Path(path).absolute()
+    for candidate in (path, *path.parents):
+        try:
+            return os.stat(candidate).st_dev
+        except FileNotFoundError:
+            continue
+    return None
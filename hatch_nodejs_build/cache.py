@@ -7,16 +7,17 @@ from functools import cached_property
 from pathlib import Path
 
 import requests
-import semantic_version
 from hatchling.bridge.app import Application
 from platformdirs import user_cache_dir
+from semantic_version import Version
 
-from hatch_nodejs_build._util import node_matches
+from hatch_nodejs_build._util import node_matches, parse_version
 
 
 class NodeCache:
     def __init__(self):
         self.app_name = "hatch-nodejs-build"
+        self._scan_cache: tuple[int, list[Path]] = None
 
     @cached_property
     def cache_dir(self):
@@ -38,7 +39,7 @@ class NodeCache:
             node_version: _get_node_dir_executable(node)
             for node in self._get_all()
             if node_matches(
-                node_version := semantic_version.Version(node.name.split("-")[1][1:]),
+                node_version := parse_version(node.name.split("-")[1][1:]),
                 required_version,
             )
         }
@@ -48,11 +49,18 @@ class NodeCache:
 
     def _get_all_versions(self):
         return [
-            semantic_version.Version(directory.name.split("-")[1][1:])
+            parse_version(directory.name.split("-")[1][1:])
             for directory in self._get_all()
         ]
 
     def _get_all(self):
+        # Adding or removing an entry bumps the directory mtime, rescan only then.
+        mtime = os.stat(self.cache_dir).st_mtime_ns
+        if self._scan_cache is None or self._scan_cache[0] != mtime:
+            self._scan_cache = (mtime, self._scan())
+        return self._scan_cache[1]
+
+    def _scan(self):
         return [
             self.cache_dir / directory
             for directory in os.listdir(self.cache_dir)
@@ -81,17 +89,21 @@ class NodeCache:
         else:
             versions = [r["version"] for r in releases if r["version"].startswith("v")]
 
+        # The release index holds far more versions than the shared parse cache, parse
+        # each of them once here instead.
+        parsed = [(Version(v[1:]), v) for v in versions]
         if required_engine:
-            spec = semantic_version.NpmSpec(required_engine)
-            versions = [
-                v for v in versions if spec.match(semantic_version.Version(v[1:]))
+            parsed = [
+                (version, v)
+                for version, v in parsed
+                if node_matches(version, required_engine)
             ]
-            if not versions:
+            if not parsed:
                 raise ValueError(
                     f"No matching Node.js versions found for range: {required_engine}"
                 )
 
-        return max(versions, key=lambda v: semantic_version.Version(v[1:]))
+        return max(parsed)[1]
 
     def _download_and_extract_node(self, version, app: Application = None):
         """Downloads and extracts the Node.js binary for the specified version."""
@@ -155,12 +167,17 @@ class NodeCache:
         extracted_dir = self.cache_dir / file_name.replace(f".{ext}", "")
         return extracted_dir
 
-    def install(self, required_engine, lts=True, app: Application = None):
+    def install(
+        self,
+        required_engine: str | None,
+        lts=True,
+        app: Application = None,
+    ):
         """Installs the appropriate Node.js version based on package.json's engines field."""
         if app:
             app.display_info("Looking Node.js version in online index.")
             app.display_info(
-                "└─ Matching: " + required_engine if required_engine else "Any version"
+                f"└─ Matching: {required_engine}" if required_engine else "Any version"
             )
             app.display_info("└─ LTS only: " + "yes" if lts else "no")
 
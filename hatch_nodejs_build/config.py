@@ -1,35 +1,48 @@
+import sys
 from pathlib import Path
-from typing import Annotated
 
-from pydantic import BaseModel, BeforeValidator, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 def validate_and_split(value: str | list[str]) -> list[str]:
+    # Command tokens repeat across configs (`npm`, `install`, ...), intern them.
     if isinstance(value, list):
-        return [ str(i) for i in value]
+        return [sys.intern(str(i)) for i in value]
     if not isinstance(value, str):
         raise ValueError("Must be a string or list of strings")
     if not value.strip():
         raise ValueError("Cannot be empty")
-    return value.split(",")
-
-
-type Command = Annotated[list[str], BeforeValidator(validate_and_split)]
+    return [sys.intern(token) for token in value.split(",")]
 
 
 class NodeJsBuildConfiguration(BaseModel):
+    # The kebab-case aliases are spelled out so no alias generator runs while the
+    # schema is built, and the validator is built eagerly at class definition.
     model_config = ConfigDict(
-        extra="forbid", alias_generator=lambda x: x.replace("_", "-")
+        extra="forbid",
+        frozen=True,
+        populate_by_name=True,
+        validate_assignment=False,
+        defer_build=False,
     )
 
     dependencies: list[str] = []
 
-    require_node: bool = True
-    node_executable: str = None
+    require_node: bool = Field(default=True, alias="require-node")
+    node_executable: str | None = Field(default=None, alias="node-executable")
     lts: bool = True
-    install_command: Command = ["{npm}", "install"]
-    build_command: Command = ["{npm}", "run", "build"]
-    source_dir: Path = Path("./browser")
-    artifact_dir: Path = Path("./dist")
-    bundle_dir: Path = Path("./bundle")
-    inline_bundle: bool = False
+    install_command: list[str] = Field(
+        default=["{npm}", "install"], alias="install-command"
+    )
+    build_command: list[str] = Field(
+        default=["{npm}", "run", "build"], alias="build-command"
+    )
+    source_dir: Path = Field(default=Path("./browser"), alias="source-dir")
+    artifact_dir: Path = Field(default=Path("./dist"), alias="artifact-dir")
+    bundle_dir: Path = Field(default=Path("./bundle"), alias="bundle-dir")
+    inline_bundle: bool = Field(default=False, alias="inline-bundle")
+
+    @field_validator("install_command", "build_command", mode="before")
+    @classmethod
+    def split_command(cls, value):
+        return validate_and_split(value)
@@ -1,25 +1,66 @@
 import glob
-import json
 import shutil
 import sys
 from pathlib import Path
 from subprocess import run
+from typing import ClassVar
 
 from hatchling.builders.hooks.plugin.interface import BuildHookInterface
 
-from hatch_nodejs_build._util import get_node_executable_version, node_matches
+from hatch_nodejs_build._util import (
+    discover_node,
+    get_node_executable_version,
+    node_matches,
+    select_copy_function,
+)
 from hatch_nodejs_build.cache import NodeCache
 from hatch_nodejs_build.config import NodeJsBuildConfiguration
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+NPM_EXECUTABLE = "npm.cmd" if sys.platform == "win32" else "npm"
+# Files in the source directory that decide what the install command installs.
+DEPENDENCY_FILES = (
+    "package.json",
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+)
+
 
 class NodeJsBuildHook(BuildHookInterface):
     PLUGIN_NAME = "nodejs-build"
+    # Installs that already ran in this process. The hooks of all targets in one build
+    # (e.g. sdist and wheel) share a single install; the key includes the modification
+    # times of the dependency files, so changed dependencies are installed again.
+    _completed_installs: ClassVar[set[tuple]] = set()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.plugin_config: NodeJsBuildConfiguration = None
-        self.node_executable: str = None
+        self.node_executable = None
         self.node_cache = NodeCache()
+        self._package_json_cache: tuple[tuple[Path, int], dict] = None
+        self._source_dir: Path = None
+        self._artifact_dir: Path = None
+        self._bundled_dir: Path = None
+
+    @property
+    def node_executable(self) -> Path | None:
+        return self._node_executable
+
+    @node_executable.setter
+    def node_executable(self, executable: str | Path | None):
+        # Normalize to a Path once, npm is installed next to node.
+        if executable is None:
+            self._node_executable = self.npm_executable = None
+        else:
+            self._node_executable = Path(executable)
+            self.npm_executable = self._node_executable.with_name(NPM_EXECUTABLE)
 
     def initialize(self, version, build_data):
         self.prepare_plugin_config()
@@ -34,17 +75,8 @@ class NodeJsBuildHook(BuildHookInterface):
         self.run_install_command()
         self.run_build_command()
 
-        artifact_dir = (
-            (self.plugin_config.source_dir / self.plugin_config.artifact_dir)
-            .absolute()
-            .resolve()
-        )
-        artifact_list = glob.glob(str(artifact_dir / "**"), recursive=True)
-
-        if not artifact_list:
-            raise RuntimeError(
-                f"[hatch-nodejs-build] no artifacts found in '{artifact_dir}'"
-            )
+        artifact_dir = self._artifact_dir
+        artifact_list = self._collect_artifacts(artifact_dir)
 
         self.app.display_info(
             f"Copying {len(artifact_list)} artifacts from '{artifact_dir}'..."
@@ -53,17 +85,17 @@ class NodeJsBuildHook(BuildHookInterface):
         for artifact in artifact_list:
             self.app.display_debug(f"- {artifact}")
 
-        project_name = self.build_config.builder.metadata.core.name.replace("-", "_")
-        bundled_dir = (
-            (Path(self.root) / project_name / self.plugin_config.bundle_dir)
-            .absolute()
-            .resolve()
-        )
+        bundled_dir = self._bundled_dir
         self.app.display_info(
             f"Copying artifacts from '{artifact_dir}'\n to '{bundled_dir}'..."
         )
 
-        shutil.copytree(artifact_dir, bundled_dir, dirs_exist_ok=True)
+        shutil.copytree(
+            artifact_dir,
+            bundled_dir,
+            dirs_exist_ok=True,
+            copy_function=select_copy_function(artifact_dir, bundled_dir),
+        )
         build_data["artifacts"].append(bundled_dir)
 
         if self.plugin_config.inline_bundle:
@@ -95,13 +127,40 @@ class NodeJsBuildHook(BuildHookInterface):
                 css_bundle.unlink()
 
             bundle_index = bundled_dir / "index.html"
+            # Replace rather than overwrite, the bundled file may be a hardlink.
+            bundle_index.unlink(missing_ok=True)
             bundle_index.write_text(index_content)
             self.app.display_info(f"Inlined bundle index written to '{bundle_index}'")
 
         self.app.display_success("hatch-nodejs-build finished successfully")
 
+    def _collect_artifacts(self, artifact_dir: Path) -> list[str]:
+        # `**` also matches the directory itself, even when it doesn't exist.
+        artifact_list = [
+            artifact
+            for artifact in glob.glob(str(artifact_dir / "**"), recursive=True)
+            if Path(artifact) != artifact_dir
+        ]
+        if not artifact_list:
+            raise RuntimeError(
+                f"[hatch-nodejs-build] no artifacts found in '{artifact_dir}'"
+            )
+        return artifact_list
+
     def prepare_plugin_config(self):
-        self.plugin_config = NodeJsBuildConfiguration(**self.config)
+        # The hook config doesn't change during a build, validate it only once.
+        if self.plugin_config is None:
+            self.plugin_config = NodeJsBuildConfiguration.model_validate(self.config)
+
+        # Resolve the directories once, each resolve walks the filesystem.
+        self._source_dir = self.plugin_config.source_dir.resolve()
+        self._artifact_dir = (
+            self._source_dir / self.plugin_config.artifact_dir
+        ).resolve()
+        project_name = self.build_config.builder.metadata.core.name.replace("-", "_")
+        self._bundled_dir = (
+            Path(self.root) / project_name / self.plugin_config.bundle_dir
+        ).resolve()
 
     def require_node(self):
         package = self.get_package_json()
@@ -112,18 +171,14 @@ class NodeJsBuildHook(BuildHookInterface):
         self.app.display_info(f"Looking for {node_description}...")
 
         # Find Node.js from the configured executable, or on PATH
-        node_version = get_node_executable_version(
-            self.plugin_config.node_executable or "node"
-        )
+        node_executable, node_version = discover_node(
+            self.plugin_config.node_executable
+        ) or (None, None)
 
         # Check if it matches the possible requirement in package.json
         if node_version is not None and node_matches(node_version, required_engine):
             # If no node_executable given, `node` is on PATH, hopefully also `npm`
-            if not self.plugin_config.node_executable:
-                self.node_executable = shutil.which("node")
-            else:
-                self.node_executable = self.plugin_config.node_executable
-
+            self.node_executable = node_executable
             self.app.display_info(
                 f"Found Node.js {node_version}: '{self.node_executable}'"
             )
@@ -160,33 +215,69 @@ class NodeJsBuildHook(BuildHookInterface):
     def get_package_json(self):
         package_json_path = Path(self.plugin_config.source_dir) / "package.json"
         try:
-            return json.loads(package_json_path.read_text())
+            # Reparse only when the file changed since the last read.
+            key = (package_json_path, package_json_path.stat().st_mtime_ns)
+            if self._package_json_cache is None or self._package_json_cache[0] != key:
+                package = json_loads(package_json_path.read_bytes())
+                self._package_json_cache = (key, package)
+            return self._package_json_cache[1]
         except FileNotFoundError:
             raise Exception(
                 f"[hatch-nodejs-build] package.json not found in source directory '{package_json_path.absolute()}'"
             )
 
     def run_install_command(self):
-        return self._run_command("install", self.plugin_config.install_command)
+        if self._install_key() in self._completed_installs:
+            self.app.display_info(
+                "Install command already ran for these dependencies, skipping."
+            )
+            return
+        self._run_command("install", self.plugin_config.install_command)
+        # The install may write the lockfile, record the state it left behind.
+        self._completed_installs.add(self._install_key())
+
+    def _install_key(self):
+        dependency_mtimes = []
+        for name in DEPENDENCY_FILES:
+            try:
+                mtime = (self._source_dir / name).stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            dependency_mtimes.append(mtime)
+        return (
+            self._source_dir,
+            tuple(self.plugin_config.install_command),
+            self.node_executable,
+            tuple(dependency_mtimes),
+        )
 
     def run_build_command(self):
         return self._run_command("build", self.plugin_config.build_command)
 
     def format_tokens(self, command: list[str]):
-        tokens = {
-            "node": self.node_executable,
-            "npm": str(
-                Path(self.node_executable).parent
-                / ("npm.cmd" if sys.platform == "win32" else "npm")
-            ),
-        }
-        return [token.format(**tokens) for token in command]
+        if self.node_executable is None:
+            tokens = {}
+        else:
+            tokens = {
+                "node": str(self.node_executable),
+                "npm": str(self.npm_executable),
+            }
+        try:
+            return [token.format(**tokens) for token in command]
+        except KeyError as e:
+            if e.args[0] not in ("node", "npm"):
+                raise
+            raise RuntimeError(
+                f"[hatch-nodejs-build] Command '{' '.join(command)}' uses "
+                f"'{{{e.args[0]}}}', but no Node.js executable was resolved. Enable "
+                "'require-node' or name the executable in the command."
+            ) from None
 
     def _run_command(self, tag: str, tokens: list[str]):
         command = self.format_tokens(tokens)
         self.app.display_waiting(f"Running {tag} command: '{' '.join(command)}'")
 
-        cwd = self.plugin_config.source_dir.absolute().resolve()
+        cwd = self._source_dir
         self.app.display_info(f"└ working directory: '{cwd}'")
         self.app.display_mini_header(f"{tag.title()} logs")
         run(
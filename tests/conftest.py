@@ -1,16 +1,85 @@
 """Pytest configuration and shared fixtures."""
 
+import copy
 import json
+import os
 import shutil
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
 
+from hatch_nodejs_build._util import discover_node
 from hatch_nodejs_build.cache import NodeCache
+from hatch_nodejs_build.config import NodeJsBuildConfiguration
 from hatch_nodejs_build.plugin import NodeJsBuildHook
 
+_PACKAGE_JSON = json.dumps(
+    {
+        "name": "test-app",
+        "version": "1.0.0",
+        "engines": {"node": ">=18.0.0"},
+        "scripts": {"install": "echo 'install complete'", "build": "echo 'build complete'"},
+        "dependencies": {"react": "^18.0.0"},
+    }
+).encode()
+_INDEX_JS = b"""
+    console.log('Hello, World!');
+    """
+_BUNDLE_JS = b"console.log('Hello, World!');"
+_BUNDLE_CSS = b"body { margin: 0; }"
+_INDEX_HTML = b"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Test App</title>
+        <style data-bundle-css></style>
+    </head>
+    <body>
+        <div id="root"></div>
+        <script data-bundle-js></script>
+    </body>
+    </html>
+    """
+_HOOK_CONFIG = {
+    "require-node": True,
+    "source-dir": "browser",
+    "artifact-dir": "dist",
+    "bundle-dir": "bundle",
+    "install-command": "npm,install",
+    "build-command": "npm,run,build",
+    "inline-bundle": False,
+}
+
+
+def _materialize(tree: dict[str, bytes], root: Path):
+    """Write a ``{relative path: content}`` tree, creating each directory once."""
+    for directory in {(root / path).parent for path in tree}:
+        os.makedirs(directory, exist_ok=True)
+    for path, content in tree.items():
+        (root / path).write_bytes(content)
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    """Reset the caches that hooks share for the lifetime of the process."""
+    discover_node.cache_clear()
+    NodeJsBuildHook._completed_installs.clear()
+    yield
+
+
+@pytest.fixture(scope="session")
+def config_validator():
+    """The compiled validator of the configuration model, built once per session.
+
+    The model sets ``defer_build=False``, so its schema is already built at import and
+    ``model_rebuild`` is a no-op unless a forward reference is still unresolved.
+    """
+    NodeJsBuildConfiguration.model_rebuild()
+    return NodeJsBuildConfiguration.__pydantic_validator__
+
 
 @pytest.fixture
 def temp_dir():
@@ -20,70 +89,94 @@ def temp_dir():
     shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+def _ignore(*args, **kwargs):
+    pass
+
+
 @pytest.fixture
 def mock_app():
-    """Create a mock Hatch application."""
-    app = Mock()
-    app.display_mini_header = Mock()
-    app.display_info = Mock()
-    app.display_debug = Mock()
-    app.display_waiting = Mock()
-    app.display_warning = Mock()
-    app.display_success = Mock()
-    return app
+    """Create a stub Hatch application that discards all output."""
+    return SimpleNamespace(
+        display_mini_header=_ignore,
+        display_info=_ignore,
+        display_debug=_ignore,
+        display_waiting=_ignore,
+        display_warning=_ignore,
+        display_success=_ignore,
+    )
 
 
 @pytest.fixture
 def mock_build_config():
-    """Create a mock build configuration."""
-    config = Mock()
-    config.builder = Mock()
-    config.builder.metadata = Mock()
-    config.builder.metadata.core = Mock()
-    config.builder.metadata.core.name = "test-project"
-    return config
+    """Create a stub build configuration."""
+    return SimpleNamespace(
+        builder=SimpleNamespace(metadata=SimpleNamespace(core=SimpleNamespace(name="test-project")))
+    )
+
+
+@pytest.fixture(scope="module")
+def hook_factory():
+    """Return a factory for hooks that share the read-only mock dependencies per module.
+
+    Each hook gets its own copy of the config dict and its own mock app, so call
+    histories don't carry over between tests; tests that change the shared build
+    config must restore it, e.g. with ``monkeypatch``.
+    """
+    # The build config and metadata are only read, plain namespaces suffice
+    mock_build_config = SimpleNamespace(
+        builder=SimpleNamespace(metadata=SimpleNamespace(core=SimpleNamespace(name="test-project")))
+    )
+    mock_metadata = SimpleNamespace()
+
+    def hook_factory(root_dir, target_name="wheel"):
+        return NodeJsBuildHook(
+            root=str(root_dir),
+            config=copy.copy(_HOOK_CONFIG),
+            build_config=mock_build_config,
+            metadata=mock_metadata,
+            directory=".",
+            target_name=target_name,
+            app=Mock(),
+        )
+
+    return hook_factory
+
+
+@pytest.fixture(scope="session")
+def base_plugin_config():
+    """The validated configuration of the hooks built by ``hook_factory``.
+
+    The model is frozen, so it can be shared; derive variants with ``model_copy``.
+    """
+    return NodeJsBuildConfiguration.model_validate(_HOOK_CONFIG)
 
 
 @pytest.fixture
 def sample_package_json():
     """Sample package.json content."""
-    return {
-        "name": "test-app",
-        "version": "1.0.0",
-        "engines": {"node": ">=18.0.0"},
-        "scripts": {"install": "echo 'install complete'", "build": "echo 'build complete'"},
-        "dependencies": {"react": "^18.0.0"},
-    }
+    return json.loads(_PACKAGE_JSON)
 
 
 @pytest.fixture
-def basic_project_structure(temp_dir, sample_package_json):
+def basic_project_structure(temp_dir):
     """Create a basic project structure."""
-    # Create source directory
+    _materialize(
+        {
+            "browser/package.json": _PACKAGE_JSON,
+            "browser/src/index.js": _INDEX_JS,
+            "browser/dist/bundle.js": _BUNDLE_JS,
+            "browser/dist/bundle.css": _BUNDLE_CSS,
+        },
+        temp_dir,
+    )
     source_dir = temp_dir / "browser"
-    source_dir.mkdir()
 
-    # Create package.json
-    package_json = source_dir / "package.json"
-    package_json.write_text(json.dumps(sample_package_json))
-
-    # Create source files
-    src_dir = source_dir / "src"
-    src_dir.mkdir()
-
-    (src_dir / "index.js").write_text("""
-    console.log('Hello, World!');
-    """)
-
-    # Create artifact directory
-    artifact_dir = source_dir / "dist"
-    artifact_dir.mkdir()
-
-    # Create some artifacts
-    (artifact_dir / "bundle.js").write_text("console.log('Hello, World!');")
-    (artifact_dir / "bundle.css").write_text("body { margin: 0; }")
-
-    return {"root_dir": temp_dir, "source_dir": source_dir, "artifact_dir": artifact_dir, "package_json": package_json}
+    return {
+        "root_dir": temp_dir,
+        "source_dir": source_dir,
+        "artifact_dir": source_dir / "dist",
+        "package_json": source_dir / "package.json",
+    }
 
 
 @pytest.fixture
@@ -102,7 +195,7 @@ def sample_config():
 @pytest.fixture
 def node_hook(mock_app, mock_build_config, sample_config, temp_dir):
     """Create a NodeJsBuildHook instance with mock dependencies."""
-    mock_metadata = Mock()
+    mock_metadata = SimpleNamespace()
     hook = NodeJsBuildHook(
         root=str(temp_dir),
         config=sample_config,
@@ -110,12 +203,12 @@ def node_hook(mock_app, mock_build_config, sample_config, temp_dir):
         metadata=mock_metadata,
         directory=".",
         target_name="wheel",
+        app=mock_app,
     )
-    hook.app = mock_app
     return hook
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def node_cache():
     """Create a NodeCache instance."""
     return NodeCache()
@@ -132,43 +225,22 @@ def sample_node_releases():
 
 
 @pytest.fixture
-def inline_bundle_project(temp_dir, sample_package_json):
+def inline_bundle_project(temp_dir):
     """Create a project structure for testing inline bundle."""
-    # Create source directory
+    _materialize(
+        {
+            "browser/package.json": _PACKAGE_JSON,
+            "browser/dist/bundle.js": _BUNDLE_JS,
+            "browser/dist/bundle.css": _BUNDLE_CSS,
+            "browser/index.html": _INDEX_HTML,
+        },
+        temp_dir,
+    )
     source_dir = temp_dir / "browser"
-    source_dir.mkdir()
-
-    # Create package.json
-    package_json = source_dir / "package.json"
-    package_json.write_text(json.dumps(sample_package_json))
-
-    # Create artifact directory
-    artifact_dir = source_dir / "dist"
-    artifact_dir.mkdir()
-
-    # Create artifacts
-    (artifact_dir / "bundle.js").write_text("console.log('Hello, World!');")
-    (artifact_dir / "bundle.css").write_text("body { margin: 0; }")
-
-    # Create index template
-    index_template = source_dir / "index.html"
-    index_template.write_text("""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Test App</title>
-        <style data-bundle-css></style>
-    </head>
-    <body>
-        <div id="root"></div>
-        <script data-bundle-js></script>
-    </body>
-    </html>
-    """)
 
     return {
         "root_dir": temp_dir,
         "source_dir": source_dir,
-        "artifact_dir": artifact_dir,
-        "index_template": index_template,
+        "artifact_dir": source_dir / "dist",
+        "index_template": source_dir / "index.html",
     }
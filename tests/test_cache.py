@@ -1,7 +1,7 @@
 """Tests for hatch_nodejs_build.cache module."""
 
+import os
 import sys
-import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -16,17 +16,13 @@ from hatch_nodejs_build.cache import NodeCache, _get_node_dir_executable
 class TestNodeCache:
     """Test cases for the NodeCache class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path):
+        """Set up a cache in a per-test directory."""
         self.cache = NodeCache()
-        self.temp_dir = tempfile.mkdtemp()
-        self.cache.cache_dir = Path(self.temp_dir)
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        # Assigning the instance attribute skips the cached_property, so the real
+        # user cache directory is never created.
+        self.cache.cache_dir = tmp_path
 
     def test_cache_dir_creation(self):
         """Test that cache directory is created."""
@@ -75,6 +71,14 @@ class TestNodeCache:
         result = self.cache.has(">=18.0.0 <19.0.0")
         assert result is True
 
+    def test_has_empty_requirement(self):
+        """Test that an empty range, e.g. an empty engines.node, accepts any version."""
+        assert self.cache.has("") is False
+
+        (self.cache.cache_dir / "node-v16.0.0").mkdir()
+
+        assert self.cache.has("") is True
+
     def test_get_no_versions_available(self):
         """Test get method when no versions are available."""
         with pytest.raises(KeyError):
@@ -298,6 +302,22 @@ class TestNodeCache:
         assert node_dir1 in directories
         assert node_dir2 in directories
 
+    def test_get_all_rescans_on_change(self):
+        """Test that _get_all only rescans the cache directory after it changes."""
+        (self.cache.cache_dir / "node-v18.0.0").mkdir()
+
+        with patch("hatch_nodejs_build.cache.os.listdir", wraps=os.listdir) as mock_listdir:
+            assert len(self.cache._get_all()) == 1
+            assert len(self.cache._get_all()) == 1
+            assert mock_listdir.call_count == 1
+
+            (self.cache.cache_dir / "node-v20.0.0").mkdir()
+            stat = self.cache.cache_dir.stat()
+            os.utime(self.cache.cache_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+            assert len(self.cache._get_all()) == 2
+            assert mock_listdir.call_count == 2
+
 
 class TestGetNodeDirExecutable:
     """Test cases for the _get_node_dir_executable function."""
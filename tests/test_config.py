@@ -8,6 +8,25 @@ from pydantic import ValidationError
 
 from hatch_nodejs_build.config import NodeJsBuildConfiguration, validate_and_split
 
+_DEFAULT_SOURCE = Path("./browser")
+_DEFAULT_ARTIFACT = Path("./dist")
+_DEFAULT_BUNDLE = Path("./bundle")
+_WEB_SOURCE = Path("./src/web")
+_OUT_ARTIFACT = Path("./out")
+_STATIC_BUNDLE = Path("./static")
+_CUSTOM_SOURCE = Path("./custom/source")
+_CUSTOM_ARTIFACT = Path("./custom/artifact")
+_CUSTOM_BUNDLE = Path("./custom/bundle")
+
+
+def _mk(**kwargs):
+    """Build a configuration from trusted, already typed values without validating them.
+
+    ``model_construct`` skips validation, so only use it in tests that don't check
+    parsing; kebab-case keys are translated to field names up front.
+    """
+    return NodeJsBuildConfiguration.model_construct(**{key.replace("-", "_"): value for key, value in kwargs.items()})
+
 
 class TestValidateAndSplit:
     """Test cases for the validate_and_split function."""
@@ -30,6 +49,12 @@ class TestValidateAndSplit:
         assert result == ["npm", " install", " run"]
         assert isinstance(result, List)
 
+    def test_validate_and_split_interns_tokens(self):
+        """Test that validate_and_split shares token strings between commands."""
+        first = validate_and_split("".join(["np", "m,install"]))
+        second = validate_and_split(["".join(["n", "pm"]), "run"])
+        assert first[0] is second[0]
+
     def test_validate_and_split_empty_string(self):
         """Test validate_and_split with an empty string."""
         with pytest.raises(ValueError, match="Cannot be empty"):
@@ -51,7 +76,7 @@ class TestNodeJsBuildConfiguration:
 
     def test_default_configuration(self):
         """Test default configuration values."""
-        config = NodeJsBuildConfiguration()
+        config = _mk()
 
         assert config.dependencies == []
         assert config.require_node is True
@@ -59,9 +84,9 @@ class TestNodeJsBuildConfiguration:
         assert config.lts is True
         assert config.install_command == ["{npm}", "install"]
         assert config.build_command == ["{npm}", "run", "build"]
-        assert config.source_dir == Path("./browser")
-        assert config.artifact_dir == Path("./dist")
-        assert config.bundle_dir == Path("./bundle")
+        assert config.source_dir == _DEFAULT_SOURCE
+        assert config.artifact_dir == _DEFAULT_ARTIFACT
+        assert config.bundle_dir == _DEFAULT_BUNDLE
         assert config.inline_bundle is False
 
     def test_custom_configuration(self):
@@ -87,9 +112,9 @@ class TestNodeJsBuildConfiguration:
         assert config.lts is False
         assert config.install_command == ["yarn", "install"]
         assert config.build_command == ["yarn", "build"]
-        assert config.source_dir == Path("./src/web")
-        assert config.artifact_dir == Path("./out")
-        assert config.bundle_dir == Path("./static")
+        assert config.source_dir == _WEB_SOURCE
+        assert config.artifact_dir == _OUT_ARTIFACT
+        assert config.bundle_dir == _STATIC_BUNDLE
         assert config.inline_bundle is True
 
     def test_configuration_with_kebab_case_keys(self):
@@ -111,33 +136,43 @@ class TestNodeJsBuildConfiguration:
         assert config.node_executable == "/custom/node"
         assert config.install_command == ["yarn", "install"]
         assert config.build_command == ["yarn", "build"]
-        assert config.source_dir == Path("./src/web")
-        assert config.artifact_dir == Path("./out")
-        assert config.bundle_dir == Path("./static")
+        assert config.source_dir == _WEB_SOURCE
+        assert config.artifact_dir == _OUT_ARTIFACT
+        assert config.bundle_dir == _STATIC_BUNDLE
         assert config.inline_bundle is True
 
-    def test_configuration_extra_fields_forbidden(self):
+    def test_configuration_extra_fields_forbidden(self, config_validator):
         """Test that extra fields raise ValidationError."""
         with pytest.raises(ValidationError):
-            NodeJsBuildConfiguration(invalid_field="should_raise_error")
+            config_validator.validate_python({"invalid_field": "should_raise_error"})
 
-    def test_configuration_invalid_command_type(self):
+    def test_configuration_invalid_command_type(self, config_validator):
         """Test configuration with invalid command type."""
         with pytest.raises(ValidationError):
-            NodeJsBuildConfiguration(
-                install_command=123  # Should be string or list
-            )
+            config_validator.validate_python({"install-command": 123})  # Should be string or list
 
-    def test_configuration_invalid_path_type(self):
+    def test_configuration_invalid_path_type(self, config_validator):
         """Test configuration with invalid path type."""
         with pytest.raises(ValidationError):
-            NodeJsBuildConfiguration(
-                source_dir=123  # Should be Path or string
-            )
+            config_validator.validate_python({"source-dir": 123})  # Should be Path or string
+
+    def test_configuration_populate_by_name(self):
+        """Test configuration with snake_case field names."""
+        config = NodeJsBuildConfiguration(require_node=False, install_command="yarn,install")
+
+        assert config.require_node is False
+        assert config.install_command == ["yarn", "install"]
+
+    def test_configuration_frozen(self):
+        """Test that the configuration can't be modified after validation."""
+        config = NodeJsBuildConfiguration()
+
+        with pytest.raises(ValidationError):
+            config.inline_bundle = True
 
     def test_configuration_model_dump_json(self):
         """Test that model_dump_json works correctly."""
-        config = NodeJsBuildConfiguration(**{"require-node": False, "node-executable": "/custom/node"})
+        config = _mk(**{"require-node": False, "node-executable": "/custom/node"})
 
         json_str = config.model_dump_json(by_alias=True)
         assert "require-node" in json_str
@@ -145,7 +180,7 @@ class TestNodeJsBuildConfiguration:
 
     def test_configuration_model_dump(self):
         """Test that model_dump works correctly."""
-        config = NodeJsBuildConfiguration(**{"require-node": False, "node-executable": "/custom/node"})
+        config = _mk(**{"require-node": False, "node-executable": "/custom/node"})
 
         data = config.model_dump(by_alias=True)
         assert data["require-node"] is False
@@ -160,6 +195,6 @@ class TestNodeJsBuildConfiguration:
         assert isinstance(config.source_dir, Path)
         assert isinstance(config.artifact_dir, Path)
         assert isinstance(config.bundle_dir, Path)
-        assert config.source_dir == Path("./custom/source")
-        assert config.artifact_dir == Path("./custom/artifact")
-        assert config.bundle_dir == Path("./custom/bundle")
+        assert config.source_dir == _CUSTOM_SOURCE
+        assert config.artifact_dir == _CUSTOM_ARTIFACT
+        assert config.bundle_dir == _CUSTOM_BUNDLE
@@ -1,386 +1,226 @@
 """Integration tests for hatch_nodejs_build."""
 
-import json
-import shutil
-import tempfile
-from pathlib import Path
-from unittest.mock import Mock, patch
+from functools import lru_cache
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 
+from hatch_nodejs_build.config import NodeJsBuildConfiguration
 from hatch_nodejs_build.plugin import NodeJsBuildHook
 
+_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Test App</title>
+    <style data-bundle-css></style>
+</head>
+<body>
+    <div id="root"></div>
+    <script data-bundle-js></script>
+</body>
+</html>
+"""
+_BUNDLE_JS = "console.log('Hello, World!');"
+_BUNDLE_CSS = "body { margin: 0; }"
+
+
+@pytest.fixture
+def project_dir(tmp_path, monkeypatch):
+    """Run the test from a fresh project directory, the hook resolves its directories against it."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def artifact_dir(project_dir):
+    """Create the artifact directory of the default configuration."""
+    artifact_dir = project_dir / "browser" / "dist"
+    artifact_dir.mkdir(parents=True)
+    return artifact_dir
+
+
+_DEFAULT_CONFIG = {
+    "require-node": True,
+    "source-dir": "browser",
+    "artifact-dir": "dist",
+    "bundle-dir": "bundle",
+    "install-command": "npm,install",
+    "build-command": "npm,run,build",
+}
+
+# (config, artifact files, expected bundle directory name)
+WORKFLOW_CASES = {
+    "npm": (
+        _DEFAULT_CONFIG,
+        {"bundle.js": _BUNDLE_JS, "bundle.css": _BUNDLE_CSS},
+        "bundle",
+    ),
+    "yarn": (
+        {**_DEFAULT_CONFIG, "install-command": "yarn,install", "build-command": "yarn,build"},
+        {"bundle.js": "console.log('Yarn build');"},
+        "bundle",
+    ),
+    "custom-directories": (
+        {
+            **_DEFAULT_CONFIG,
+            "require-node": False,
+            "source-dir": "src/web",
+            "artifact-dir": "out",
+            "bundle-dir": "web",
+        },
+        {"app.js": "console.log('Custom app');"},
+        "web",
+    ),
+    "nested-artifacts": (
+        _DEFAULT_CONFIG,
+        {"static/js/app.js": "console.log('Nested app');", "styles.css": "body { color: blue; }"},
+        "bundle",
+    ),
+}
 
-class TestNodeJsBuildIntegration:
-    """Integration tests for the complete Node.js build process."""
-
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.root_dir = Path(self.temp_dir)
-
-        # Create mock app
-        self.mock_app = Mock()
-        self.mock_app.display_mini_header = Mock()
-        self.mock_app.display_info = Mock()
-        self.mock_app.display_debug = Mock()
-        self.mock_app.display_waiting = Mock()
-        self.mock_app.display_warning = Mock()
-        self.mock_app.display_success = Mock()
-
-        # Create mock build config
-        self.mock_build_config = Mock()
-        self.mock_build_config.builder = Mock()
-        self.mock_build_config.builder.metadata = Mock()
-        self.mock_build_config.builder.metadata.core = Mock()
-        self.mock_build_config.builder.metadata.core.name = "test-project"
-
-        # Create test directory structure
-        self.setup_test_project()
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def setup_test_project(self):
-        """Set up a test project structure."""
-        # Create source directory
-        self.source_dir = self.root_dir / "browser"
-        self.source_dir.mkdir()
-
-        # Create package.json
-        self.package_json = self.source_dir / "package.json"
-        self.package_json.write_text(
-            json.dumps(
-                {
-                    "name": "test-app",
-                    "version": "1.0.0",
-                    "engines": {"node": ">=18.0.0"},
-                    "scripts": {"install": "echo 'install complete'", "build": "echo 'build complete'"},
-                    "dependencies": {"react": "^18.0.0"},
-                }
-            )
-        )
 
-        # Create source files
-        src_dir = self.source_dir / "src"
-        src_dir.mkdir()
+@lru_cache
+def _plugin_config(items):
+    """Validate each distinct hook config once; the validated configuration is frozen."""
+    return NodeJsBuildConfiguration.model_validate(dict(items))
+
 
-        (src_dir / "index.js").write_text("""
-        console.log('Hello, World!');
-        """)
+@pytest.fixture(scope="module")
+def integration_build_config():
+    """Create the mock build config, shared by the tests of this module."""
+    return SimpleNamespace(
+        builder=SimpleNamespace(metadata=SimpleNamespace(core=SimpleNamespace(name="test-project")))
+    )
 
-        # Create artifact directory
-        self.artifact_dir = self.source_dir / "dist"
-        self.artifact_dir.mkdir()
 
-    def create_hook(self, config=None):
-        """Create a hook instance with given configuration."""
+@pytest.fixture
+def create_hook(project_dir, integration_build_config):
+    """Return a factory for hook instances with a given configuration."""
+
+    def create_hook(config=None):
         if config is None:
-            config = {
-                "require-node": True,
-                "source-dir": "browser",
-                "artifact-dir": "dist",
-                "bundle-dir": "bundle",
-                "install-command": "npm,install",
-                "build-command": "npm,run,build",
-            }
-
-        mock_metadata = Mock()
+            config = _DEFAULT_CONFIG
+
+        mock_metadata = SimpleNamespace()
         hook = NodeJsBuildHook(
-            root=str(self.root_dir),
+            root=str(project_dir),
             config=config,
-            build_config=self.mock_build_config,
+            build_config=integration_build_config,
             metadata=mock_metadata,
             directory=".",
             target_name="wheel",
+            app=Mock(),
         )
-        # Mock the app property
-        hook._app = self.mock_app
+        # prepare_plugin_config only validates the config when it isn't set yet.
+        hook.plugin_config = _plugin_config(tuple(sorted(config.items())))
 
         return hook
 
-    def test_complete_build_workflow(self):
-        """Test the complete build workflow."""
-        # Create some fake artifacts
-        (self.artifact_dir / "bundle.js").write_text("console.log('Hello, World!');")
-        (self.artifact_dir / "bundle.css").write_text("body { margin: 0; }")
-
-        hook = self.create_hook()
-        build_data = {"artifacts": []}
-
-        # Mock the file system operations to avoid path issues
-        with patch.object(hook, "require_node") as mock_require, patch.object(
-            hook, "run_install_command"
-        ) as mock_install, patch.object(hook, "run_build_command") as mock_build, patch(
-            "shutil.copytree"
-        ) as mock_copytree, patch("glob.glob") as mock_glob:
-            # Mock glob to return our artifact files
-            mock_glob.return_value = [
-                str(self.artifact_dir / "bundle.js"),
-                str(self.artifact_dir / "bundle.css"),
-                str(self.artifact_dir),  # Directory itself
-            ]
-
-            hook.initialize("1.0.0", build_data)
-
-        # Verify the workflow was called
-        mock_require.assert_called_once()
-        mock_install.assert_called_once()
-        mock_build.assert_called_once()
-
-        # Verify copytree was called with correct paths
-        mock_copytree.assert_called_once()
-
-        # Verify artifacts were added to build_data
-        assert len(build_data["artifacts"]) == 1
-        bundle_dir = build_data["artifacts"][0]
-        assert bundle_dir.name == "bundle"
-
-    def test_build_workflow_with_inline_bundle(self):
-        """Test build workflow with inline bundle."""
-        # Create artifacts and index template
-        (self.artifact_dir / "bundle.js").write_text("console.log('Hello, World!');")
-        (self.artifact_dir / "bundle.css").write_text("body { margin: 0; }")
-
-        index_template = self.source_dir / "index.html"
-        index_template.write_text("""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Test App</title>
-            <style data-bundle-css></style>
-        </head>
-        <body>
-            <div id="root"></div>
-            <script data-bundle-js></script>
-        </body>
-        </html>
-        """)
-
-        config = {
-            "require-node": True,
-            "source-dir": "browser",
-            "artifact-dir": "dist",
-            "bundle-dir": "bundle",
-            "install-command": "npm,install",
-            "build-command": "npm,run,build",
-            "inline-bundle": True,
-        }
-
-        hook = self.create_hook(config)
-        build_data = {"artifacts": []}
-
-        # Mock all file system operations
-        with patch.object(hook, "require_node"), patch.object(hook, "run_install_command"), patch.object(
-            hook, "run_build_command"
-        ), patch("shutil.copytree") as mock_copytree, patch("glob.glob") as mock_glob, patch(
-            "pathlib.Path.read_text"
-        ) as mock_read, patch("pathlib.Path.write_text") as mock_write, patch(
-            "pathlib.Path.exists"
-        ) as mock_exists, patch("pathlib.Path.unlink") as mock_unlink:
-            # Mock glob to return artifact files
-            mock_glob.return_value = [
-                str(self.artifact_dir / "bundle.js"),
-                str(self.artifact_dir / "bundle.css"),
-                str(self.artifact_dir),
-            ]
-
-            # Mock file operations for inlining
-            def mock_read_side_effect(path_obj=None):
-                path_str = str(path_obj) if path_obj else ""
-                if "bundle.js" in path_str:
-                    return "console.log('Hello, World!');"
-                elif "bundle.css" in path_str:
-                    return "body { margin: 0; }"
-                elif "index.html" in path_str:
-                    return """
-                    <!DOCTYPE html>
-                    <html>
-                    <head>
-                        <title>Test App</title>
-                        <style data-bundle-css></style>
-                    </head>
-                    <body>
-                        <div id="root"></div>
-                        <script data-bundle-js></script>
-                    </body>
-                    </html>
-                    """
-                return ""
-
-            mock_read.side_effect = mock_read_side_effect
-            mock_exists.return_value = True
-
-            hook.initialize("1.0.0", build_data)
-
-        # Verify copytree was called
-        mock_copytree.assert_called_once()
-
-        # Verify artifacts were added
-        assert len(build_data["artifacts"]) == 1
-
-    def test_build_workflow_with_custom_directories(self):
-        """Test build workflow with custom directory configuration."""
-        # Create custom directory structure
-        custom_source = self.root_dir / "src" / "web"
-        custom_source.mkdir(parents=True)
-
-        custom_artifact = custom_source / "out"
-        custom_artifact.mkdir()
-
-        # Create package.json in custom location
-        (custom_source / "package.json").write_text(
-            json.dumps({"name": "custom-app", "version": "1.0.0", "scripts": {"build": "echo 'custom build'"}})
-        )
+    return create_hook
 
-        # Create artifacts
-        (custom_artifact / "app.js").write_text("console.log('Custom app');")
 
-        config = {
-            "require-node": False,  # Skip Node.js requirement for simplicity
-            "source-dir": "src/web",
-            "artifact-dir": "out",
-            "bundle-dir": "web",
-            "install-command": "npm,install",
-            "build-command": "npm,run,build",
-        }
-
-        hook = self.create_hook(config)
-        build_data = {"artifacts": []}
-
-        # Mock file system operations
-        with patch.object(hook, "run_install_command"), patch.object(hook, "run_build_command"), patch(
-            "shutil.copytree"
-        ) as mock_copytree, patch("glob.glob") as mock_glob:
-            # Mock glob to return artifact files
-            mock_glob.return_value = [str(custom_artifact / "app.js"), str(custom_artifact)]
-
-            hook.initialize("1.0.0", build_data)
-
-        # Verify copytree was called
-        mock_copytree.assert_called_once()
-
-        # Verify artifacts were copied to custom location
-        assert len(build_data["artifacts"]) == 1
-        web_dir = build_data["artifacts"][0]
-        assert web_dir.name == "web"
-
-    def test_build_workflow_with_yarn(self):
-        """Test build workflow using Yarn instead of npm."""
-        (self.artifact_dir / "bundle.js").write_text("console.log('Yarn build');")
-
-        config = {
-            "require-node": True,
-            "source-dir": "browser",
-            "artifact-dir": "dist",
-            "bundle-dir": "bundle",
-            "install-command": "yarn,install",
-            "build-command": "yarn,build",
-        }
-
-        hook = self.create_hook(config)
-        build_data = {"artifacts": []}
-
-        # Mock file system operations and command execution
-        with patch.object(hook, "require_node"), patch.object(hook, "_run_command") as mock_run, patch(
-            "shutil.copytree"
-        ) as mock_copytree, patch("glob.glob") as mock_glob:
-            # Mock glob to return artifact files
-            mock_glob.return_value = [str(self.artifact_dir / "bundle.js"), str(self.artifact_dir)]
-
-            hook.initialize("1.0.0", build_data)
-
-        # Verify Yarn commands were used
-        install_call = mock_run.call_args_list[0]
-        build_call = mock_run.call_args_list[1]
-
-        assert "yarn" in install_call[0][1][0]
-        assert "install" in install_call[0][1]
-        assert "yarn" in build_call[0][1][0]
-        assert "build" in build_call[0][1]
-
-    def test_build_workflow_error_handling(self):
-        """Test error handling in build workflow."""
-        hook = self.create_hook()
-        build_data = {"artifacts": []}
-
-        # Mock package.json reading, command execution, and glob to simulate no artifacts
-        with patch.object(hook, "get_package_json") as mock_get_package, patch.object(
-            hook, "run_install_command"
-        ), patch.object(hook, "run_build_command"), patch("glob.glob") as mock_glob:
-            mock_get_package.return_value = {"name": "test", "version": "1.0.0"}
-            mock_glob.return_value = []
-
-            with pytest.raises(RuntimeError, match="no artifacts found"):
-                hook.initialize("1.0.0", build_data)
-
-    def test_build_workflow_with_project_name_hyphens(self):
-        """Test build workflow with project name containing hyphens."""
-        self.mock_build_config.builder.metadata.core.name = "my-test-project"
-
-        (self.artifact_dir / "bundle.js").write_text("console.log('Hyphen test');")
-
-        hook = self.create_hook()
-        build_data = {"artifacts": []}
-
-        # Mock file system operations
-        with patch.object(hook, "require_node"), patch.object(hook, "run_install_command"), patch.object(
-            hook, "run_build_command"
-        ), patch("shutil.copytree") as mock_copytree, patch("glob.glob") as mock_glob:
-            # Mock glob to return artifact files
-            mock_glob.return_value = [str(self.artifact_dir / "bundle.js"), str(self.artifact_dir)]
-
-            hook.initialize("1.0.0", build_data)
-
-        # Verify hyphens were converted to underscores
-        bundle_dir = build_data["artifacts"][0]
-        assert "my_test_project" in str(bundle_dir)
-
-    def test_build_workflow_empty_artifact_directory(self):
-        """Test build workflow with empty artifact directory."""
-        hook = self.create_hook()
-        build_data = {"artifacts": []}
-
-        # Mock package.json reading, command execution, and glob to simulate no artifacts
-        with patch.object(hook, "get_package_json") as mock_get_package, patch.object(
-            hook, "run_install_command"
-        ), patch.object(hook, "run_build_command"), patch("glob.glob") as mock_glob:
-            mock_get_package.return_value = {"name": "test", "version": "1.0.0"}
-            mock_glob.return_value = []
-
-            with pytest.raises(RuntimeError, match="no artifacts found"):
-                hook.initialize("1.0.0", build_data)
-
-    def test_build_workflow_nested_artifacts(self):
-        """Test build workflow with nested artifact structure."""
-        # Create nested artifact structure
-        nested_dir = self.artifact_dir / "static" / "js"
-        nested_dir.mkdir(parents=True)
-
-        (nested_dir / "app.js").write_text("console.log('Nested app');")
-        (self.artifact_dir / "styles.css").write_text("body { color: blue; }")
-
-        hook = self.create_hook()
-        build_data = {"artifacts": []}
-
-        # Mock file system operations
-        with patch.object(hook, "require_node"), patch.object(hook, "run_install_command"), patch.object(
-            hook, "run_build_command"
-        ), patch("shutil.copytree") as mock_copytree, patch("glob.glob") as mock_glob:
-            # Mock glob to return artifact files including nested ones
-            mock_glob.return_value = [
-                str(nested_dir / "app.js"),
-                str(self.artifact_dir / "styles.css"),
-                str(self.artifact_dir),
-                str(nested_dir),
-                str(self.artifact_dir / "static"),
-            ]
-
-            hook.initialize("1.0.0", build_data)
-
-        # Verify copytree was called
-        mock_copytree.assert_called_once()
-
-        # Verify artifacts were added
-        assert len(build_data["artifacts"]) == 1
+@pytest.fixture
+def patched(monkeypatch):
+    """Patch out the Node.js steps of a workflow test."""
+    patched = SimpleNamespace(require_node=Mock(), run_command=Mock())
+    monkeypatch.setattr(NodeJsBuildHook, "require_node", patched.require_node)
+    monkeypatch.setattr(NodeJsBuildHook, "_run_command", patched.run_command)
+    return patched
+
+
+@pytest.mark.parametrize(("config", "artifacts", "bundle_name"), WORKFLOW_CASES.values(), ids=WORKFLOW_CASES.keys())
+def test_build_workflow(create_hook, patched, project_dir, config, artifacts, bundle_name):
+    """Test the complete build workflow for different configurations."""
+    artifact_dir = project_dir / config["source-dir"] / config["artifact-dir"]
+    for name, content in artifacts.items():
+        artifact = artifact_dir / name
+        artifact.parent.mkdir(parents=True, exist_ok=True)
+        artifact.write_text(content)
+
+    hook = create_hook(config)
+    build_data = {"artifacts": []}
+
+    hook.initialize("1.0.0", build_data)
+
+    # Verify the workflow ran the configured commands
+    assert patched.require_node.called is config["require-node"]
+    assert [call.args for call in patched.run_command.call_args_list] == [
+        ("install", config["install-command"].split(",")),
+        ("build", config["build-command"].split(",")),
+    ]
+
+    # Verify the artifacts were copied to the bundle directory
+    assert len(build_data["artifacts"]) == 1
+    bundled_dir = build_data["artifacts"][0]
+    assert bundled_dir.name == bundle_name
+    for name, content in artifacts.items():
+        assert (bundled_dir / name).read_text() == content
+
+
+def test_build_workflow_with_inline_bundle(create_hook, patched, artifact_dir):
+    """Test build workflow with inline bundle."""
+    # Create artifacts and the index template in the source directory
+    (artifact_dir / "bundle.js").write_text(_BUNDLE_JS)
+    (artifact_dir / "bundle.css").write_text(_BUNDLE_CSS)
+    (artifact_dir.parent / "index.html").write_text(_HTML_TEMPLATE)
+
+    hook = create_hook({**_DEFAULT_CONFIG, "inline-bundle": True})
+    build_data = {"artifacts": []}
+
+    hook.initialize("1.0.0", build_data)
+
+    assert len(build_data["artifacts"]) == 1
+    bundled_dir = build_data["artifacts"][0]
+
+    # Verify the bundles were inlined into the index and removed
+    index_content = (bundled_dir / "index.html").read_text()
+    assert f"<script>{_BUNDLE_JS}</script>" in index_content
+    assert f"<style>{_BUNDLE_CSS}</style>" in index_content
+    assert not (bundled_dir / "bundle.js").exists()
+    assert not (bundled_dir / "bundle.css").exists()
+
+    # The artifacts and the template are left untouched
+    assert (artifact_dir / "bundle.js").read_text() == _BUNDLE_JS
+    assert (artifact_dir.parent / "index.html").read_text() == _HTML_TEMPLATE
+
+
+def test_build_workflow_error_handling(create_hook, tmp_path):
+    """Test error handling in build workflow."""
+    # The build didn't produce the artifact directory at all
+    with pytest.raises(RuntimeError, match="no artifacts found"):
+        create_hook()._collect_artifacts(tmp_path / "dist")
+
+
+def test_build_workflow_with_project_name_hyphens(
+    create_hook, patched, artifact_dir, integration_build_config, monkeypatch
+):
+    """Test build workflow with project name containing hyphens."""
+    (artifact_dir / "bundle.js").write_text("console.log('Hyphen test');")
+
+    # The mock build config is shared by the module, monkeypatch restores the name.
+    monkeypatch.setattr(integration_build_config.builder.metadata.core, "name", "my-test-project")
+
+    hook = create_hook()
+    build_data = {"artifacts": []}
+
+    hook.initialize("1.0.0", build_data)
+
+    # Verify hyphens were converted to underscores
+    bundle_dir = build_data["artifacts"][0]
+    assert bundle_dir.parent.name == "my_test_project"
+    assert (bundle_dir / "bundle.js").exists()
+
+
+def test_build_workflow_empty_artifact_directory(create_hook, artifact_dir):
+    """Test build workflow with empty artifact directory."""
+    with pytest.raises(RuntimeError, match="no artifacts found"):
+        create_hook()._collect_artifacts(artifact_dir)
+
+
+def test_collect_artifacts(create_hook, artifact_dir):
+    """Test that only the contents of the artifact directory are collected."""
+    (artifact_dir / "bundle.js").write_text(_BUNDLE_JS)
+
+    assert create_hook()._collect_artifacts(artifact_dir) == [str(artifact_dir / "bundle.js")]
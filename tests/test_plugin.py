@@ -1,92 +1,72 @@
 """Tests for hatch_nodejs_build.plugin module."""
 
 import json
-import shutil
-import sys
-import tempfile
+import os
 from pathlib import Path
 from subprocess import CalledProcessError
-from unittest.mock import MagicMock, Mock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock, Mock
 
 import pytest
 from hatchling.builders.hooks.plugin.interface import BuildHookInterface
 
 from hatch_nodejs_build.config import NodeJsBuildConfiguration
-from hatch_nodejs_build.plugin import NodeJsBuildHook
+from hatch_nodejs_build.plugin import NPM_EXECUTABLE, NodeJsBuildHook
 
 
 class TestNodeJsBuildHook:
     """Test cases for the NodeJsBuildHook class."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.root_dir = Path(self.temp_dir)
-
-        # Create mock app
-        self.mock_app = Mock()
-        self.mock_app.display_mini_header = Mock()
-        self.mock_app.display_info = Mock()
-        self.mock_app.display_debug = Mock()
-        self.mock_app.display_waiting = Mock()
-        self.mock_app.display_warning = Mock()
-        self.mock_app.display_success = Mock()
-
-        # Create mock config
-        self.mock_config = {
-            "require-node": True,
-            "source-dir": "browser",
-            "artifact-dir": "dist",
-            "bundle-dir": "bundle",
-            "install-command": "npm,install",
-            "build-command": "npm,run,build",
-            "inline-bundle": False,
+    # Mock package.json instead of creating real file, nested mappings included read-only
+    MOCK_PACKAGE_JSON = MappingProxyType(
+        {
+            "name": "test-app",
+            "version": "1.0.0",
+            "scripts": MappingProxyType({"build": "echo 'build complete'"}),
         }
+    )
 
-        # Create mock build config
-        self.mock_build_config = Mock()
-        self.mock_build_config.builder = Mock()
-        self.mock_build_config.builder.metadata = Mock()
-        self.mock_build_config.builder.metadata.core = Mock()
-        self.mock_build_config.builder.metadata.core.name = "test-project"
-
-        # Create mock metadata
-        self.mock_metadata = Mock()
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path, hook_factory):
+        """Set up test fixtures."""
+        self.root_dir = tmp_path
+        self.hook_factory = hook_factory
 
         # Create hook instance with required arguments
-        self.hook = NodeJsBuildHook(
-            root=str(self.root_dir),
-            config=self.mock_config,
-            build_config=self.mock_build_config,
-            metadata=self.mock_metadata,
-            directory=".",
-            target_name="wheel",
-        )
-
-        # Mock the app property
-        self.hook._app = self.mock_app
+        self.hook = hook_factory(self.root_dir)
 
-        # Create test directory structure
+        # Test directory structure, only created on disk by `real_source_tree`
         self.source_dir = self.root_dir / "browser"
-        self.source_dir.mkdir()
         self.artifact_dir = self.source_dir / "dist"
-        self.artifact_dir.mkdir()
-
-        # Mock package.json instead of creating real file
-        self.mock_package_json_content = {
-            "name": "test-app",
-            "version": "1.0.0",
-            "scripts": {"build": "echo 'build complete'"},
-        }
 
         # Mock the get_package_json method to return our mock content
-        self.hook.get_package_json = Mock(return_value=self.mock_package_json_content)
-
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.hook.get_package_json = Mock(return_value=self.MOCK_PACKAGE_JSON)
+
+    @pytest.fixture
+    def real_source_tree(self):
+        """Create the source and artifact directories for tests that need them on disk."""
+        self.artifact_dir.mkdir(parents=True)
+        return self.source_dir
+
+    @pytest.fixture
+    def prepared_hook(self, base_plugin_config):
+        """The hook with its configuration prepared and a fake node executable."""
+        # Reuse the validated configuration, only the directories are resolved per test.
+        self.hook.plugin_config = base_plugin_config
+        self.hook.prepare_plugin_config()
+        self.hook.node_executable = "/fake/node"
+        return self.hook
+
+    @pytest.fixture
+    def stub_initialize(self, monkeypatch, prepared_hook):
+        """Stub out the Node.js steps and the artifact copy of initialize."""
+        monkeypatch.setattr(prepared_hook, "require_node", lambda: None)
+        monkeypatch.setattr(prepared_hook, "run_install_command", lambda: None)
+        monkeypatch.setattr(prepared_hook, "run_build_command", lambda: None)
+        stubs = SimpleNamespace(copytree=MagicMock(), glob=MagicMock())
+        monkeypatch.setattr("shutil.copytree", stubs.copytree)
+        monkeypatch.setattr("glob.glob", stubs.glob)
+        return stubs
 
     def test_plugin_name(self):
         """Test that PLUGIN_NAME is set correctly."""
@@ -95,15 +75,7 @@ class TestNodeJsBuildHook:
     def test_initialization(self):
         """Test hook initialization."""
         # Create a new hook instance for this test
-        mock_metadata = Mock()
-        hook = NodeJsBuildHook(
-            root=str(self.root_dir),
-            config=self.mock_config,
-            build_config=self.mock_build_config,
-            metadata=mock_metadata,
-            directory=".",
-            target_name="wheel",
-        )
+        hook = self.hook_factory(self.root_dir)
 
         assert hook.plugin_config is None
         assert hook.node_executable is None
@@ -117,12 +89,29 @@ class TestNodeJsBuildHook:
         assert self.hook.plugin_config.require_node is True
         assert self.hook.plugin_config.source_dir == Path("./browser")
 
+    def test_prepare_plugin_config_resolves_directories(self):
+        """Test that prepare_plugin_config resolves the build directories."""
+        self.hook.prepare_plugin_config()
+
+        assert self.hook._source_dir == Path("browser").resolve()
+        assert self.hook._artifact_dir == Path("browser/dist").resolve()
+        assert self.hook._bundled_dir == (self.root_dir / "test_project" / "bundle").resolve()
+
+    def test_prepare_plugin_config_validates_once(self):
+        """Test that prepare_plugin_config reuses an already validated configuration."""
+        self.hook.prepare_plugin_config()
+        plugin_config = self.hook.plugin_config
+
+        self.hook.prepare_plugin_config()
+
+        assert self.hook.plugin_config is plugin_config
+
     def test_get_package_json_success(self):
         """Test successful package.json reading."""
         self.hook.prepare_plugin_config()
 
         # Mock the get_package_json method to return test data
-        self.hook.get_package_json = Mock(return_value=self.mock_package_json_content)
+        self.hook.get_package_json = Mock(return_value=self.MOCK_PACKAGE_JSON)
 
         result = self.hook.get_package_json()
 
@@ -138,6 +127,23 @@ class TestNodeJsBuildHook:
         with pytest.raises(Exception, match="package.json not found"):
             self.hook.get_package_json()
 
+    def test_get_package_json_cached(self, monkeypatch, real_source_tree):
+        """Test that package.json is only parsed again after it changes."""
+        monkeypatch.chdir(self.root_dir)
+        self.hook.prepare_plugin_config()
+        package_json = self.source_dir / "package.json"
+        package_json.write_text(json.dumps(self.MOCK_PACKAGE_JSON, default=dict))
+
+        first = NodeJsBuildHook.get_package_json(self.hook)
+        assert first == self.MOCK_PACKAGE_JSON
+        assert NodeJsBuildHook.get_package_json(self.hook) is first
+
+        package_json.write_bytes(b'{"name": "changed"}')
+        stat = package_json.stat()
+        os.utime(package_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert NodeJsBuildHook.get_package_json(self.hook) == {"name": "changed"}
+
     def test_format_tokens(self):
         """Test format_tokens method."""
         self.hook.node_executable = "/fake/node"
@@ -146,7 +152,7 @@ class TestNodeJsBuildHook:
 
         assert result == [
             "/fake/node",
-            ("npm.cmd" if sys.platform == "win32" else "npm"),
+            NPM_EXECUTABLE,
             "install",
         ]
 
@@ -158,16 +164,31 @@ class TestNodeJsBuildHook:
 
         # Should replace npm with the correct path based on platform
         assert len(result) == 2
-        assert result[0] == str(Path("/fake/node").parent / ("npm.cmd" if sys.platform == "win32" else "npm"))
-        assert result[0].endswith("npm")
+        assert result[0] == str(Path("/fake/node").parent / NPM_EXECUTABLE)
+
+    def test_format_tokens_without_node_executable(self):
+        """Test that node tokens without a resolved executable raise a clear error."""
+        assert self.hook.format_tokens(["npm", "install"]) == ["npm", "install"]
+
+        with pytest.raises(RuntimeError, match=r"no Node\.js executable was resolved"):
+            self.hook.format_tokens(["{npm}", "install"])
+
+    def test_node_executable_normalized(self):
+        """Test that node_executable is stored as a Path with npm next to it."""
+        self.hook.node_executable = "/fake/bin/node"
+
+        assert self.hook.node_executable == Path("/fake/bin/node")
+        assert self.hook.npm_executable == Path("/fake/bin") / NPM_EXECUTABLE
+
+        self.hook.node_executable = None
+
+        assert self.hook.npm_executable is None
 
-    @patch("hatch_nodejs_build.plugin.run")
-    def test_run_command_success(self, mock_run):
+    def test_run_command_success(self, mocker, prepared_hook):
         """Test successful command execution."""
-        self.hook.node_executable = "/fake/node"
-        self.hook.prepare_plugin_config()
+        mock_run = mocker.patch("hatch_nodejs_build.plugin.run")
 
-        self.hook._run_command("test", ["echo", "hello"])
+        prepared_hook._run_command("test", ["echo", "hello"])
 
         # Use any() to check if the call was made with the correct parameters
         # since the exact path might vary
@@ -175,156 +196,231 @@ class TestNodeJsBuildHook:
         call_args = mock_run.call_args
         assert call_args[0][0] == ["echo", "hello"]
         assert call_args[1]["check"] is True
-        assert str(self.hook.plugin_config.source_dir) in str(call_args[1]["cwd"])
+        assert str(prepared_hook.plugin_config.source_dir) in str(call_args[1]["cwd"])
 
-    @patch("hatch_nodejs_build.plugin.run")
-    def test_run_command_failure(self, mock_run):
+    def test_run_command_failure(self, mocker, prepared_hook):
         """Test command execution failure."""
-        mock_run.side_effect = CalledProcessError(1, "echo")
-        self.hook.node_executable = "/fake/node"
-        self.hook.prepare_plugin_config()
+        mocker.patch("hatch_nodejs_build.plugin.run", side_effect=CalledProcessError(1, "echo"))
 
         with pytest.raises(CalledProcessError) as excinfo:
-            self.hook._run_command("test", ["echo", "hello"])
+            prepared_hook._run_command("test", ["echo", "hello"])
             assert str(self.plugin_config.source_dir) in str(excinfo.value)
 
-    def test_run_install_command(self):
+    def test_run_install_command(self, mocker, prepared_hook):
         """Test run_install_command method."""
-        self.hook.node_executable = "/fake/node"
-        self.hook.prepare_plugin_config()
+        mock_run = mocker.patch.object(prepared_hook, "_run_command")
+
+        prepared_hook.run_install_command()
+
+        # The tokens get formatted, so npm path replaces {npm}
+        expected_call = mock_run.call_args[0]
+        assert expected_call[0] == "install"
+        assert len(expected_call[1]) == 2
+        assert expected_call[1][0].endswith("npm")
+        assert expected_call[1][1] == "install"
+
+    def test_run_install_command_once_per_process(self, mocker, prepared_hook):
+        """Test that hooks for several targets share one install."""
+        other_hook = self.hook_factory(self.root_dir, target_name="sdist")
+        other_hook.node_executable = "/fake/node"
+        other_hook.prepare_plugin_config()
+
+        mock_run = mocker.patch.object(NodeJsBuildHook, "_run_command")
+
+        prepared_hook.run_install_command()
+        other_hook.run_install_command()
+
+        mock_run.assert_called_once()
+
+    def test_run_install_command_again_after_dependency_change(
+        self, mocker, monkeypatch, prepared_hook, real_source_tree
+    ):
+        """Test that the install runs again once package.json changed."""
+        # The source directory is resolved against the working directory.
+        monkeypatch.chdir(self.root_dir)
+        prepared_hook.prepare_plugin_config()
+        package_json = self.source_dir / "package.json"
+        package_json.write_bytes(b'{"name": "test-app"}')
+        mock_run = mocker.patch.object(NodeJsBuildHook, "_run_command")
+
+        prepared_hook.run_install_command()
+        prepared_hook.run_install_command()
+        assert mock_run.call_count == 1
+
+        package_json.write_bytes(b'{"name": "test-app", "dependencies": {"react": "^18.0.0"}}')
+        stat = package_json.stat()
+        os.utime(package_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        prepared_hook.run_install_command()
+
+        assert mock_run.call_count == 2
+
+    @pytest.fixture
+    def require_node_stubs(self, mocker, prepared_hook):
+        """Stub node discovery, the version check and the node cache for require_node."""
+        prepared_hook.get_package_json = Mock(return_value={"engines": {"node": ">=18.0.0"}})
+        prepared_hook.node_cache = Mock()
+        return SimpleNamespace(
+            discover_node=mocker.patch("hatch_nodejs_build.plugin.discover_node"),
+            get_version=mocker.patch("hatch_nodejs_build.plugin.get_node_executable_version", return_value="20.0.0"),
+            node_cache=prepared_hook.node_cache,
+        )
+
+    def test_require_node_on_path(self, prepared_hook, require_node_stubs):
+        """Test require_node with a matching Node.js found by discover_node."""
+        require_node_stubs.discover_node.return_value = ("/usr/bin/node", "20.0.0")
+
+        prepared_hook.require_node()
+
+        require_node_stubs.discover_node.assert_called_once_with(prepared_hook.plugin_config.node_executable)
+        require_node_stubs.node_cache.has.assert_not_called()
+        assert prepared_hook.node_executable == Path("/usr/bin/node")
+        assert prepared_hook.npm_executable == Path("/usr/bin") / NPM_EXECUTABLE
+
+    def test_require_node_from_cache(self, prepared_hook, require_node_stubs):
+        """Test require_node with a non-matching Node.js on PATH and a matching cached one."""
+        require_node_stubs.discover_node.return_value = ("/usr/bin/node", "16.0.0")
+        require_node_stubs.node_cache.has.return_value = True
+        require_node_stubs.node_cache.get.return_value = Path("/cache/node-v20.0.0/bin/node")
+
+        prepared_hook.require_node()
+
+        require_node_stubs.node_cache.has.assert_called_once_with(">=18.0.0")
+        require_node_stubs.node_cache.get.assert_called_once_with(">=18.0.0")
+        require_node_stubs.node_cache.install.assert_not_called()
+        assert prepared_hook.node_executable == Path("/cache/node-v20.0.0/bin/node")
+        assert prepared_hook.npm_executable == Path("/cache/node-v20.0.0/bin") / NPM_EXECUTABLE
+
+    def test_require_node_install(self, prepared_hook, require_node_stubs):
+        """Test require_node installing Node.js when it's neither on PATH nor cached."""
+        require_node_stubs.discover_node.return_value = None
+        require_node_stubs.node_cache.has.return_value = False
+        require_node_stubs.node_cache.install.return_value = Path("/cache/node-v20.0.0/bin/node")
+
+        prepared_hook.require_node()
+
+        require_node_stubs.node_cache.install.assert_called_once_with(
+            ">=18.0.0", prepared_hook.plugin_config.lts, prepared_hook.app
+        )
+        assert prepared_hook.node_executable == Path("/cache/node-v20.0.0/bin/node")
+        assert prepared_hook.npm_executable == Path("/cache/node-v20.0.0/bin") / NPM_EXECUTABLE
+
+    def test_require_node_empty_engine(self, prepared_hook, require_node_stubs):
+        """Test that an empty engines.node is treated as no requirement."""
+        prepared_hook.get_package_json.return_value = {"engines": {"node": ""}}
+        require_node_stubs.discover_node.return_value = None
+        require_node_stubs.node_cache.has.return_value = True
+        require_node_stubs.node_cache.get.return_value = Path("/cache/bin/node")
 
-        with patch.object(self.hook, "_run_command") as mock_run:
-            self.hook.run_install_command()
-            # The tokens get formatted, so npm path replaces {npm}
-            expected_call = mock_run.call_args[0]
-            assert expected_call[0] == "install"
-            assert len(expected_call[1]) == 2
-            assert expected_call[1][0].endswith("npm")
-            assert expected_call[1][1] == "install"
+        prepared_hook.require_node()
 
-    def test_run_build_command(self):
+        prepared_hook.app.display_info.assert_any_call("Looking for Node.js...")
+        prepared_hook.node_cache.has.assert_called_once_with("")
+        assert prepared_hook.node_executable == Path("/cache/bin/node")
+
+    def test_run_build_command(self, mocker, prepared_hook):
         """Test run_build_command method."""
-        self.hook.node_executable = "/fake/node"
-        self.hook.prepare_plugin_config()
+        mock_run = mocker.patch.object(prepared_hook, "_run_command")
+
+        prepared_hook.run_build_command()
+
+        # The tokens get formatted, so npm path replaces {npm}
+        expected_call = mock_run.call_args[0]
+        assert expected_call[0] == "build"
+        assert len(expected_call[1]) == 3
+        assert expected_call[1][0].endswith("npm")
+        assert expected_call[1][1] == "run"
+        assert expected_call[1][2] == "build"
 
-        with patch.object(self.hook, "_run_command") as mock_run:
-            self.hook.run_build_command()
-            # The tokens get formatted, so npm path replaces {npm}
-            expected_call = mock_run.call_args[0]
-            assert expected_call[0] == "build"
-            assert len(expected_call[1]) == 3
-            assert expected_call[1][0].endswith("npm")
-            assert expected_call[1][1] == "run"
-            assert expected_call[1][2] == "build"
-
-    def test_initialize_no_artifacts(self):
+    def test_initialize_no_artifacts(self, prepared_hook, stub_initialize, real_source_tree):
         """Test initialize when no artifacts are found."""
-        self.hook.prepare_plugin_config()
-        self.hook.node_executable = "/fake/node"
         build_data = {"artifacts": []}
 
-        # Mock package.json and glob to simulate no artifacts
-        with patch.object(self.hook, "get_package_json") as mock_get_package, patch.object(
-            self.hook, "require_node"
-        ), patch.object(self.hook, "run_install_command"), patch.object(self.hook, "run_build_command"), patch(
-            "glob.glob"
-        ) as mock_glob:
-            mock_get_package.return_value = {"name": "test", "version": "1.0.0"}
-            mock_glob.return_value = []
+        # Mock glob to simulate no artifacts
+        stub_initialize.glob.return_value = []
 
-            with pytest.raises(RuntimeError, match="no artifacts found"):
-                self.hook.initialize("1.0.0", build_data)
+        with pytest.raises(RuntimeError, match="no artifacts found"):
+            prepared_hook.initialize("1.0.0", build_data)
 
-    def test_initialize_with_artifacts(self):
+    def test_initialize_with_artifacts(self, prepared_hook, stub_initialize, real_source_tree):
         """Test initialize with artifacts."""
-        self.hook.prepare_plugin_config()
-        self.hook.node_executable = "/fake/node"
         build_data = {"artifacts": []}
 
-        # Mock all file system operations
-        with patch.object(self.hook, "require_node"), patch.object(self.hook, "run_install_command"), patch.object(
-            self.hook, "run_build_command"
-        ), patch("shutil.copytree") as mock_copytree, patch("glob.glob") as mock_glob:
-            # Mock glob to return artifact files
-            mock_glob.return_value = [str(self.artifact_dir / "bundle.js"), str(self.artifact_dir)]
+        # Mock glob to return artifact files
+        stub_initialize.glob.return_value = [str(self.artifact_dir / "bundle.js"), str(self.artifact_dir)]
 
-            self.hook.initialize("1.0.0", build_data)
+        prepared_hook.initialize("1.0.0", build_data)
 
         # Check that artifacts were added to build_data
         assert len(build_data["artifacts"]) == 1
         assert "test_project" in str(build_data["artifacts"][0])
 
-    def test_initialize_inline_bundle(self):
+    def test_initialize_inline_bundle(
+        self, mocker, monkeypatch, prepared_hook, stub_initialize, base_plugin_config, real_source_tree
+    ):
         """Test initialize with inline bundle enabled."""
-        self.hook.prepare_plugin_config()
-        self.hook.plugin_config.inline_bundle = True
-        self.hook.node_executable = "/fake/node"
+        prepared_hook.plugin_config = base_plugin_config.model_copy(update={"inline_bundle": True})
 
         build_data = {"artifacts": []}
 
-        # Mock all file system operations
-        with patch.object(self.hook, "require_node"), patch.object(self.hook, "run_install_command"), patch.object(
-            self.hook, "run_build_command"
-        ), patch("shutil.copytree") as mock_copytree, patch("glob.glob") as mock_glob, patch(
-            "pathlib.Path.read_text"
-        ) as mock_read, patch("pathlib.Path.write_text") as mock_write, patch(
-            "pathlib.Path.exists"
-        ) as mock_exists, patch("pathlib.Path.unlink") as mock_unlink:
-            # Mock glob to return artifact files
-            mock_glob.return_value = [
-                str(self.artifact_dir / "bundle.js"),
-                str(self.artifact_dir / "bundle.css"),
-                str(self.artifact_dir),
-            ]
-
-            # Mock file operations for inlining
-            def mock_read_side_effect(path_obj=None):
-                path_str = str(path_obj) if path_obj else ""
-                if "bundle.js" in path_str:
-                    return "console.log('hello');"
-                elif "bundle.css" in path_str:
-                    return "body { color: red; }"
-                elif "index.html" in path_str:
-                    return """
-                    <!DOCTYPE html>
-                    <html>
-                    <head>
-                        <style data-bundle-css></style>
-                    </head>
-                    <body>
-                        <script data-bundle-js></script>
-                    </body>
-                    </html>
-                    """
-                return ""
-
-            mock_read.side_effect = mock_read_side_effect
-            mock_exists.return_value = True
-
-            self.hook.initialize("1.0.0", build_data)
+        # Mock glob to return artifact files
+        stub_initialize.glob.return_value = [
+            str(self.artifact_dir / "bundle.js"),
+            str(self.artifact_dir / "bundle.css"),
+            str(self.artifact_dir),
+        ]
+
+        # Mock file operations for inlining. A plain function patched on the class is
+        # bound like a method, so it receives the path being read.
+        def fake_read(path_obj, *args, **kwargs):
+            path_str = str(path_obj)
+            if "bundle.js" in path_str:
+                return "console.log('hello');"
+            elif "bundle.css" in path_str:
+                return "body { color: red; }"
+            elif "index.html" in path_str:
+                return """
+                <!DOCTYPE html>
+                <html>
+                <head>
+                    <style data-bundle-css></style>
+                </head>
+                <body>
+                    <script data-bundle-js></script>
+                </body>
+                </html>
+                """
+            return ""
+
+        monkeypatch.setattr(Path, "read_text", fake_read)
+        mock_write = mocker.patch("pathlib.Path.write_text")
+        mocker.patch("pathlib.Path.exists", return_value=True)
+        mocker.patch("pathlib.Path.unlink")
+
+        prepared_hook.initialize("1.0.0", build_data)
 
         # Verify copytree was called
-        mock_copytree.assert_called_once()
+        stub_initialize.copytree.assert_called_once()
 
         # Verify artifacts were added
         assert len(build_data["artifacts"]) == 1
 
-    def test_initialize_with_custom_project_name(self):
-        """Test initialize with custom project name containing hyphens."""
-        self.mock_build_config.builder.metadata.core.name = "test-project-with-hyphens"
+        # Verify the bundles were inlined into the index
+        index_content = mock_write.call_args.args[0]
+        assert "<script>console.log('hello');</script>" in index_content
+        assert "<style>body { color: red; }</style>" in index_content
 
-        self.hook.prepare_plugin_config()
-        self.hook.node_executable = "/fake/node"
+    def test_initialize_with_custom_project_name(self, prepared_hook, stub_initialize, monkeypatch, real_source_tree):
+        """Test initialize with custom project name containing hyphens."""
+        # The build config is shared by the module, monkeypatch restores the name.
+        monkeypatch.setattr(prepared_hook.build_config.builder.metadata.core, "name", "test-project-with-hyphens")
+        # The bundle directory is resolved from the project name, resolve it again.
+        prepared_hook.prepare_plugin_config()
         build_data = {"artifacts": []}
 
-        # Mock all file system operations
-        with patch.object(self.hook, "require_node"), patch.object(self.hook, "run_install_command"), patch.object(
-            self.hook, "run_build_command"
-        ), patch("shutil.copytree") as mock_copytree, patch("glob.glob") as mock_glob:
-            # Mock glob to return artifact files
-            mock_glob.return_value = [str(self.artifact_dir / "bundle.js"), str(self.artifact_dir)]
+        # Mock glob to return artifact files
+        stub_initialize.glob.return_value = [str(self.artifact_dir / "bundle.js"), str(self.artifact_dir)]
 
-            self.hook.initialize("1.0.0", build_data)
+        prepared_hook.initialize("1.0.0", build_data)
 
         # Check that hyphens were replaced with underscores
         assert "test_project_with_hyphens" in str(build_data["artifacts"][0])
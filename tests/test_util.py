@@ -1,107 +1,214 @@
 """Tests for hatch_nodejs_build._util module."""
 
+import errno
+import os
+import subprocess
 from subprocess import CalledProcessError
 from unittest.mock import patch
 
-from semantic_version import Version
+import pytest
+from semantic_version import NpmSpec, Version
 
-from hatch_nodejs_build._util import get_node_executable_version, node_matches
+from hatch_nodejs_build._util import (
+    clone_or_copy,
+    compile_spec,
+    discover_node,
+    get_node_executable_version,
+    link_or_copy,
+    node_matches,
+    parse_spec,
+    parse_version,
+    select_copy_function,
+)
 
 
 class TestNodeMatches:
     """Test cases for the node_matches function."""
 
-    def test_node_matches_no_requirement(self):
-        """Test that node_matches returns True when no requirement is specified."""
-        result = node_matches("18.0.0", None)
-        assert result is True
+    @pytest.mark.parametrize(
+        ("version", "requirement", "expected"),
+        [
+            ("18.0.0", None, True),
+            (Version("18.0.0"), ">=18.0.0", True),
+            ("18.0.0", ">=18.0.0", True),
+            ("16.0.0", ">=18.0.0", False),
+            ("18.5.0", ">=18.0.0 <19.0.0", True),
+            ("18.0.0", "18.0.0", True),
+            # Prerelease versions are typically considered less than release versions
+            ("18.0.0-beta.1", ">=18.0.0", False),
+        ],
+        ids=[
+            "no-requirement",
+            "version-object",
+            "matching",
+            "non-matching",
+            "complex-range",
+            "exact",
+            "prerelease",
+        ],
+    )
+    def test_node_matches(self, version, requirement, expected):
+        """Test node_matches against a version requirement."""
+        assert node_matches(version, requirement) is expected
+
+
+class TestParseHelpers:
+    """Test cases for the cached version and range parsers."""
+
+    def test_parse_version_is_cached(self):
+        """Test that parsing the same version twice returns the same object."""
+        assert parse_version("18.0.0") is parse_version("18.0.0")
+        assert parse_version("18.0.0") == Version("18.0.0")
+
+    def test_parse_spec_is_cached(self):
+        """Test that parsing the same range twice returns the same object."""
+        assert parse_spec(">=18.0.0") is parse_spec(">=18.0.0")
+        assert Version("18.1.0") in parse_spec(">=18.0.0")
+
+
+class TestCompileSpec:
+    """Test cases for the compile_spec function."""
+
+    RANGES = (">=18.0.0", ">=18.2.3", "18", "18.x", "18.*", ">=18.0.0 <20.0.0", "^18.1.0")
+    VERSIONS = ("17.9.9", "18.0.0", "18.0.0-rc.1", "18.2.3", "18.5.1", "19.0.0", "19.0.0-beta", "18.0.0+build.1")
+
+    def test_compile_spec_agrees_with_npm_spec(self):
+        """Test that specialized ranges match exactly the versions NpmSpec matches."""
+        for required_engine in self.RANGES:
+            matches = compile_spec(required_engine)
+            for version in self.VERSIONS:
+                expected = Version(version) in NpmSpec(required_engine)
+                assert matches(Version(version)) is expected, (required_engine, version)
+
+    def test_compile_spec_invalid_range(self):
+        """Test that ranges NpmSpec rejects are still rejected."""
+        with pytest.raises(ValueError):
+            compile_spec(">= 18.0.0")
 
-    def test_node_matches_with_version_object(self):
-        """Test node_matches with a Version object."""
-        version = Version("18.0.0")
-        result = node_matches(version, ">=18.0.0")
-        assert result is True
 
-    def test_node_matches_matching_version(self):
-        """Test node_matches with a matching version."""
-        result = node_matches("18.0.0", ">=18.0.0")
-        assert result is True
+class TestGetNodeExecutableVersion:
+    """Test cases for the get_node_executable_version function."""
 
-    def test_node_matches_non_matching_version(self):
-        """Test node_matches with a non-matching version."""
-        result = node_matches("16.0.0", ">=18.0.0")
-        assert result is False
+    @pytest.mark.parametrize(
+        ("stdout", "side_effect", "expected"),
+        [
+            ("v18.0.0\n", None, "18.0.0"),
+            (None, FileNotFoundError(), None),
+            (None, CalledProcessError(1, "node"), None),
+            ("", None, ""),
+            ("vinvalid version", None, "invalid version"),
+            ("  v18.0.0  \n", None, "18.0.0"),
+        ],
+        ids=["success", "file-not-found", "called-process-error", "empty-output", "malformed-output", "with-spaces"],
+    )
+    @patch("hatch_nodejs_build._util.run")
+    def test_get_node_executable_version(self, mock_run, stdout, side_effect, expected):
+        """Test version retrieval from the executable's output."""
+        mock_run.return_value.stdout = stdout
+        mock_run.side_effect = side_effect
 
-    def test_node_matches_complex_range(self):
-        """Test node_matches with a complex version range."""
-        result = node_matches("18.5.0", ">=18.0.0 <19.0.0")
-        assert result is True
+        result = get_node_executable_version("node")
 
-    def test_node_matches_exact_version(self):
-        """Test node_matches with an exact version requirement."""
-        result = node_matches("18.0.0", "18.0.0")
-        assert result is True
+        assert result == expected
+        mock_run.assert_called_once_with(
+            ["node", "--version"], check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
 
-    def test_node_matches_prerelease_version(self):
-        """Test node_matches with a prerelease version."""
-        result = node_matches("18.0.0-beta.1", ">=18.0.0")
-        assert result is False  # Prerelease versions are typically considered less than release versions
 
+class TestDiscoverNode:
+    """Test cases for the discover_node function."""
 
-class TestGetNodeExecutableVersion:
-    """Test cases for the get_node_executable_version function."""
+    def setup_method(self):
+        """Reset the process-wide discovery cache."""
+        discover_node.cache_clear()
 
-    @patch("hatch_nodejs_build._util.run")
-    def test_get_node_executable_version_success(self, mock_run):
-        """Test successful version retrieval."""
-        mock_run.return_value.stdout = b"v18.0.0\n"
+    @patch("hatch_nodejs_build._util.get_node_executable_version")
+    @patch("hatch_nodejs_build._util.shutil.which")
+    def test_discover_node_on_path(self, mock_which, mock_version):
+        """Test that node on PATH is discovered once and then served from cache."""
+        mock_which.return_value = "/usr/bin/node"
+        mock_version.return_value = "18.0.0"
 
-        result = get_node_executable_version("node")
+        assert discover_node(None) == ("/usr/bin/node", "18.0.0")
+        assert discover_node(None) == ("/usr/bin/node", "18.0.0")
 
-        assert result == "18.0.0"
-        mock_run.assert_called_once_with(["node", "--version"], check=True, capture_output=True)
+        mock_which.assert_called_once_with("node")
+        mock_version.assert_called_once_with("/usr/bin/node")
 
-    @patch("hatch_nodejs_build._util.run")
-    def test_get_node_executable_version_file_not_found(self, mock_run):
-        """Test version retrieval when executable is not found."""
-        mock_run.side_effect = FileNotFoundError()
+    @patch("hatch_nodejs_build._util.get_node_executable_version")
+    @patch("hatch_nodejs_build._util.shutil.which")
+    def test_discover_node_missing(self, mock_which, mock_version):
+        """Test that a missing executable is not spawned."""
+        mock_which.return_value = None
 
-        result = get_node_executable_version("nonexistent")
+        assert discover_node("/custom/node") is None
 
-        assert result is None
+        mock_which.assert_called_once_with("/custom/node")
+        mock_version.assert_not_called()
 
-    @patch("hatch_nodejs_build._util.run")
-    def test_get_node_executable_version_called_process_error(self, mock_run):
-        """Test version retrieval when process fails."""
-        mock_run.side_effect = CalledProcessError(1, "node")
+    @patch("hatch_nodejs_build._util.get_node_executable_version")
+    @patch("hatch_nodejs_build._util.shutil.which")
+    def test_discover_node_not_runnable(self, mock_which, mock_version):
+        """Test discovery of an executable that doesn't report a version."""
+        mock_which.return_value = "/custom/node"
+        mock_version.return_value = None
 
-        result = get_node_executable_version("node")
+        assert discover_node("/custom/node") is None
 
-        assert result is None
 
-    @patch("hatch_nodejs_build._util.run")
-    def test_get_node_executable_version_empty_output(self, mock_run):
-        """Test version retrieval with empty output."""
-        mock_run.return_value.stdout = b""
+class TestCopyFunctions:
+    """Test cases for the artifact copy functions."""
 
-        result = get_node_executable_version("node")
+    def test_link_or_copy_hardlinks(self, tmp_path):
+        """Test that files on the same filesystem are hardlinked."""
+        src = tmp_path / "bundle.js"
+        src.write_text("console.log('Hello, World!');")
+        dst = tmp_path / "copy.js"
 
-        assert result == ""
+        link_or_copy(str(src), str(dst))
 
-    @patch("hatch_nodejs_build._util.run")
-    def test_get_node_executable_version_malformed_output(self, mock_run):
-        """Test version retrieval with malformed output."""
-        mock_run.return_value.stdout = b"vinvalid version"
+        assert os.path.samefile(src, dst)
 
-        result = get_node_executable_version("node")
+    def test_link_or_copy_replaces_existing(self, tmp_path):
+        """Test that an existing destination is replaced instead of written through."""
+        src = tmp_path / "bundle.js"
+        src.write_text("new")
+        dst = tmp_path / "copy.js"
+        dst.write_text("old")
 
-        assert result == "invalid version"
+        link_or_copy(str(src), str(dst))
 
-    @patch("hatch_nodejs_build._util.run")
-    def test_get_node_executable_version_with_spaces(self, mock_run):
-        """Test version retrieval with output containing spaces."""
-        mock_run.return_value.stdout = b"  v18.0.0  \n"
+        assert dst.read_text() == "new"
 
-        result = get_node_executable_version("node")
+    def test_link_or_copy_cross_device(self, tmp_path):
+        """Test that a failing hardlink falls back to copying."""
+        src = tmp_path / "bundle.js"
+        src.write_text("console.log('Hello, World!');")
+        dst = tmp_path / "copy.js"
+
+        with patch("hatch_nodejs_build._util.os.link", side_effect=OSError(errno.EXDEV, "cross-device")):
+            link_or_copy(str(src), str(dst))
+
+        assert dst.read_text() == src.read_text()
+        assert not os.path.samefile(src, dst)
+
+    def test_clone_or_copy_copies(self, tmp_path):
+        """Test that clone_or_copy produces an independent copy."""
+        src = tmp_path / "bundle.css"
+        src.write_text("body { margin: 0; }")
+        dst = tmp_path / "copy.css"
+
+        clone_or_copy(str(src), str(dst))
+
+        assert dst.read_text() == "body { margin: 0; }"
+        assert not os.path.samefile(src, dst)
+
+    def test_select_copy_function(self, tmp_path):
+        """Test that hardlinking is only selected within one filesystem."""
+        assert select_copy_function(tmp_path, tmp_path / "missing" / "bundle") is link_or_copy
 
-        assert result == "18.0.0"
+        with patch("hatch_nodejs_build._util._device", side_effect=[1, 2]):
+            assert select_copy_function(tmp_path, tmp_path / "bundle") is clone_or_copy
+        # Neither side can be stat'ed, the devices are unknown rather than equal.
+        with patch("hatch_nodejs_build._util._device", return_value=None):
+            assert select_copy_function(tmp_path, tmp_path / "bundle") is clone_or_copy